@@ -44,6 +44,8 @@ if __name__ == "__main__":
         unitary_partitioning_method="LCU",
     )
 
+    # ground state of the previous contextual subspace, lifted back to the tapered space
+    prev_psi = None
     for n in range(1, H.n_qubits - QT.n_taper + 1):
         try:
             cs_vqe.update_stabilizers(
@@ -52,7 +54,14 @@ if __name__ == "__main__":
             # hf_cs = cs_vqe.project_state_onto_subspace(QT.tapered_ref_state)
             H_cs = cs_vqe.project_onto_subspace()
             print(H_cs)
-            gs_nrg, gs_psi = exact_gs_energy(H_cs.to_sparse_matrix)
+            # warm-start the eigensolver from the previous ground state projected into this subspace
+            initial_guess = None
+            if prev_psi is not None:
+                projected_psi = cs_vqe.project_state_onto_subspace(prev_psi)
+                if np.linalg.norm(projected_psi.state_op.coeff_vec) > 1e-8:
+                    initial_guess = projected_psi.normalize
+            gs_nrg, gs_psi = exact_gs_energy(H_cs.to_sparse_matrix, initial_guess=initial_guess)
+            prev_psi = cs_vqe.lift_state_from_subspace(gs_psi)
             if gs_nrg <= fci_energy + 0.0016:
                 break
         except Exception as e:
@@ -7,7 +7,8 @@ from symmer import process
 from symmer.operators.utils import (
     matmul_GF2, random_symplectic_matrix, string_to_symplectic, QubitOperator_to_dict, SparsePauliOp_to_dict,
     symplectic_to_string, cref_binary, check_independent, check_jordan_independent, symplectic_cleanup,
-    check_adjmat_noncontextual, symplectic_to_openfermion, binary_array_to_int, count1_in_int_bitstring
+    check_adjmat_noncontextual, symplectic_to_openfermion, binary_array_to_int, pauli_sum_to_csr_arrays,
+    pack_binary_array, commutes_termwise_packed
 )
 from tqdm.auto import tqdm
 from copy import deepcopy
@@ -609,6 +610,30 @@ class PauliwordOp:
         """
         return np.sum(np.bitwise_and(self.X_block, self.Z_block), axis=1)
 
+    @cached_property
+    def X_words(self) -> np.array:
+        """ 
+        The X block packed into uint64 words, 64 qubits per word (see pack_binary_array).
+        Computed once on first access, so the words go stale if symp_matrix is subsequently
+        modified in place.
+
+        Returns:
+            numpy uint64 array of shape (n_terms, ceil(n_qubits/64))
+        """
+        return pack_binary_array(self.X_block)
+
+    @cached_property
+    def Z_words(self) -> np.array:
+        """ 
+        The Z block packed into uint64 words, 64 qubits per word (see pack_binary_array).
+        Computed once on first access, so the words go stale if symp_matrix is subsequently
+        modified in place.
+
+        Returns:
+            numpy uint64 array of shape (n_terms, ceil(n_qubits/64))
+        """
+        return pack_binary_array(self.Z_block)
+
     def cleanup(self, 
             zero_threshold:float=1e-15
         ) -> "PauliwordOp":
@@ -963,7 +988,7 @@ class PauliwordOp:
         # Omega_PwordOp_symp = np.hstack((PwordOp.Z_block,  PwordOp.X_block)).astype(int)
         # return (self.symp_matrix @ Omega_PwordOp_symp.T) % 2 == 0
         
-        return ~matmul_GF2(self.symp_matrix, np.hstack((PwordOp.Z_block,  PwordOp.X_block)).T)
+        return commutes_termwise_packed(self.X_words, self.Z_words, PwordOp.X_words, PwordOp.Z_words)
 
     def anticommutes_termwise(self,
             PwordOp: "PauliwordOp"
@@ -1464,29 +1489,29 @@ class PauliwordOp:
         if self.n_qubits == 0:
             return csr_matrix(self.coeff_vec)
 
-        if self.n_qubits>15:
+        if self.n_terms == 0:
+            return csr_matrix((2**self.n_qubits, 2**self.n_qubits), dtype=complex)
+
+        if self.n_qubits>30:
             from symmer.utils import get_sparse_matrix_large_pauliwordop
             sparse_matrix = get_sparse_matrix_large_pauliwordop(self)
             return sparse_matrix
         else:
-            x_int = binary_array_to_int(self.X_block).reshape(-1, 1)
-            z_int = binary_array_to_int(self.Z_block).reshape(-1, 1)
+            x_int = binary_array_to_int(self.X_block).astype(np.int64)
+            z_int = binary_array_to_int(self.Z_block).astype(np.int64)
 
             Y_number = np.sum(np.bitwise_and(self.X_block, self.Z_block).astype(int), axis=1)
             global_phase = (-1j) ** Y_number
 
+            # terms sharing the same X block have identical sparsity structure (column = row XOR X_int)
+            # so are accumulated into the same entry of each row
+            x_unique, x_inverse = np.unique(x_int, return_inverse=True)
+            data, indices, indptr = pauli_sum_to_csr_arrays(
+                x_unique, z_int, global_phase * self.coeff_vec, x_inverse, self.n_qubits
+            )
             dimension = 2 ** self.n_qubits
-            row_ind = np.repeat(np.arange(dimension).reshape(1, -1), self.X_block.shape[0], axis=0)
-            col_ind = np.bitwise_xor(row_ind, x_int)
-
-            row_inds_and_Zint = np.bitwise_and(row_ind, z_int)
-            vals = global_phase.reshape(-1, 1) * (-1) ** (
-                        count1_in_int_bitstring(row_inds_and_Zint) % 2)  # .astype(complex))
-
-            values_and_coeff = np.einsum('ij,i->ij', vals, self.coeff_vec)
-
             sparse_matrix = csr_matrix(
-                (values_and_coeff.flatten(), (row_ind.flatten(), col_ind.flatten())),
+                (data, indices, indptr),
                 shape=(dimension, dimension),
                 dtype=complex
             )
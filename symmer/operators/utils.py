@@ -41,6 +41,87 @@ def matmul_GF2(A: np.array, B: np.array) -> np.array:
             C[i, j] = acc
     return C
 
+@nb.njit(fastmath=True, parallel=True, cache=True)
+def commutes_termwise_packed(X1: np.array, Z1: np.array, X2: np.array, Z2: np.array) -> np.array:
+    """
+    Termwise commutation of two Pauli operators whose X and Z blocks are packed into uint64 words
+    (see pack_binary_array). Two terms commute iff the symplectic form (X1 & Z2) ^ (Z1 & X2)
+    has even parity, which is accumulated word by word.
+
+    Args:
+        X1 (np.array): packed X block of the first operator
+        Z1 (np.array): packed Z block of the first operator
+        X2 (np.array): packed X block of the second operator
+        Z2 (np.array): packed Z block of the second operator
+    Returns:
+        C (np.array): numpy boolean array, True where terms commute
+    """
+    C = np.empty((X1.shape[0], X2.shape[0]), dtype=np.bool_)
+    for i in nb.prange(C.shape[0]):
+        for j in range(C.shape[1]):
+            acc = np.uint64(0)
+            for w in range(X1.shape[1]):
+                acc ^= (X1[i, w] & Z2[j, w]) ^ (Z1[i, w] & X2[j, w])
+            # fold the bits onto the least significant bit to obtain the parity
+            acc ^= acc >> np.uint64(32)
+            acc ^= acc >> np.uint64(16)
+            acc ^= acc >> np.uint64(8)
+            acc ^= acc >> np.uint64(4)
+            acc ^= acc >> np.uint64(2)
+            acc ^= acc >> np.uint64(1)
+            C[i, j] = (acc & np.uint64(1)) == 0
+    return C
+
+@nb.njit(fastmath=True, parallel=True, cache=True)
+def pauli_sum_to_csr_arrays(
+        x_int: np.array, z_int: np.array, coeff_vec: np.array, bucket: np.array, n_qubits: int
+    ) -> Tuple[np.array, np.array, np.array]:
+    """
+    Row-wise numba construction of the CSR arrays for a linear combination of Pauli operators.
+
+    Each Pauli term contributes exactly one nonzero to each row r, in column r XOR x_int with
+    value coeff * (-1)^popcount(r & z_int) (the (-i)^Y global phase is assumed to be absorbed
+    into coeff_vec), so the loop runs in parallel over rows with an inner loop over terms.
+    Terms are bucketed by their distinct X blocks, which share sparsity structure.
+
+    Args:
+        x_int (np.array): integer representation of each distinct X block
+        z_int (np.array): integer representation of the Z block of each term
+        coeff_vec (np.array): complex coefficient of each term, including the global phase
+        bucket (np.array): index into x_int of the X block of each term
+        n_qubits (int): number of qubits
+    Returns:
+        data (np.array): CSR data array
+        indices (np.array): CSR column indices, sorted within each row
+        indptr (np.array): CSR row pointer
+    """
+    dimension = 1 << n_qubits
+    n_cols = x_int.shape[0]
+    data = np.zeros(dimension * n_cols, dtype=np.complex128)
+    indices = np.empty(dimension * n_cols, dtype=np.int64)
+    indptr = np.arange(0, dimension * n_cols + 1, n_cols)
+    for r in nb.prange(dimension):
+        row_data = np.zeros(n_cols, dtype=np.complex128)
+        for t in range(z_int.shape[0]):
+            # parity of r & z_int by folding the bits onto the least significant bit
+            v = r & z_int[t]
+            v ^= v >> 32
+            v ^= v >> 16
+            v ^= v >> 8
+            v ^= v >> 4
+            v ^= v >> 2
+            v ^= v >> 1
+            if v & 1:
+                row_data[bucket[t]] -= coeff_vec[t]
+            else:
+                row_data[bucket[t]] += coeff_vec[t]
+        cols = r ^ x_int
+        order = np.argsort(cols)
+        for j in range(n_cols):
+            indices[r * n_cols + j] = cols[order[j]]
+            data[r * n_cols + j] = row_data[order[j]]
+    return data, indices, indptr
+
 def symplectic_to_string(symp_vec) -> str:
     """
     Returns string form of symplectic vector defined as (X | Z)
@@ -627,6 +708,37 @@ def perform_noncontextual_sweep(operator) -> "PauliwordOp":
 
     return operator[noncon_indices] 
 
+def pack_binary_array(bin_arr: np.array) -> np.array:
+    """
+    Pack the rows of a binary array into uint64 words, 64 columns per word (column j is stored
+    in bit j % 64 of word j // 64). Bitwise operations and parities may then be evaluated on
+    whole words rather than one boolean per column.
+
+    Args:
+        bin_arr (np.array): 2D numpy array of binary.
+    Returns:
+        words (np.array): 2D numpy uint64 array of shape (n_rows, ceil(n_cols/64)).
+    """
+    n_rows, n_cols = bin_arr.shape
+    n_words = max(1, -(-n_cols // 64))
+    padded = np.zeros((n_rows, n_words * 64), dtype=bool)
+    padded[:, :n_cols] = bin_arr
+    return np.packbits(padded, axis=1, bitorder='little').view('<u8').astype(np.uint64, copy=False)
+
+def packed_parity(words: np.array) -> np.array:
+    """
+    Parity of the number of set bits over the last axis of an array of packed uint64 words.
+
+    Args:
+        words (np.array): numpy uint64 array, e.g. an output of pack_binary_array.
+    Returns:
+        parity (np.array): numpy integer array of 0 (even) or 1 (odd), with the last axis reduced.
+    """
+    v = np.bitwise_xor.reduce(words, axis=-1)
+    for shift in [32, 16, 8, 4, 2, 1]:
+        v = v ^ (v >> np.uint64(shift))
+    return (v & np.uint64(1)).astype(int)
+
 def binary_array_to_int(bin_arr):
     """
     Function to convert an array composed of rows of binary into integers.
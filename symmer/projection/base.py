@@ -123,15 +123,13 @@ class S3Projection:
         # ...and finally perform the stabilizer subspace projection
         return self._perform_projection(operator=op_rotated)
     
-    def project_state(self, state: QuantumState) -> QuantumState:
+    def _state_transformation(self) -> PauliwordOp:
         """ 
-        Project a state into the stabilizer subspace.
+        The operator mapping states onto the rotated stabilizer basis, in which each
+        stabilizer fixes a single qubit in the computational basis.
 
-        Args:
-            state (QuantumState): The state which has to be projected into the stabilizer subspace.
-
-        Returns: 
-            Projection of input QuantumState into the stabilizer subspace.
+        Returns:
+            Transformation operator applied to states in project_state.
         """
         transformation_list = []
         # Hadamards where rotated onto Pauli X operators
@@ -149,11 +147,42 @@ class S3Projection:
         # Rotations mapping stabilizers onto single-qubit Pauli operators
         transformation_list += list(map(lambda s:trotter(s[0]*(np.pi/4*1j)), self.stabilizers.stabilizer_rotations))
         # Product over the transformation list yields final transformation operator
-        transformation = reduce(lambda x,y:x*y, transformation_list)
+        return reduce(lambda x,y:x*y, transformation_list)
+
+    def project_state(self, state: QuantumState) -> QuantumState:
+        """ 
+        Project a state into the stabilizer subspace.
+
+        Args:
+            state (QuantumState): The state which has to be projected into the stabilizer subspace.
+
+        Returns: 
+            Projection of input QuantumState into the stabilizer subspace.
+        """
         # apply transformation to the reference state
-        transformed_state = transformation * state
+        transformed_state = self._state_transformation() * state
         # drop stabilized qubit positions and sum over potential duplicates
         return QuantumState(
             transformed_state.state_matrix[:, self.free_qubit_indices], 
             transformed_state.state_op.coeff_vec
-        ).cleanup(zero_threshold=1e-12)
\ No newline at end of file
+        ).cleanup(zero_threshold=1e-12)
+
+    def lift_state(self, state: QuantumState) -> QuantumState:
+        """ 
+        Lift a state in the stabilizer subspace back to the full space; the inverse of project_state.
+
+        Args:
+            state (QuantumState): The state defined over the free qubits of the stabilizer subspace.
+
+        Returns: 
+            QuantumState over the full space stabilized by the stabilizers with their assigned eigenvalues.
+        """
+        assert(state.n_qubits == len(self.free_qubit_indices)), 'The input state is not defined over the stabilizer subspace'
+        # reinsert the stabilized qubit positions, fixed as |0> or |1> for eigenvalue +1 or -1 respectively
+        state_matrix = np.zeros((state.n_terms, self.stabilizers.n_qubits), dtype=int)
+        state_matrix[:, self.free_qubit_indices] = state.state_matrix
+        state_matrix[:, self.stab_qubit_indices] = self.rotated_stabilizers.coeff_vec.real < 0
+        # undo the transformation applied in project_state
+        return (
+            self._state_transformation().dagger * QuantumState(state_matrix, state.state_op.coeff_vec)
+        ).cleanup(zero_threshold=1e-12)
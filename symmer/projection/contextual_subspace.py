@@ -363,4 +363,32 @@ class ContextualSubspace(S3Projection):
                 rotation = trotter(rotation_generator)
             return self.project_state(rotation * state_to_project)
         else:
-            return self.project_state(state_to_project)
\ No newline at end of file
+            return self.project_state(state_to_project)
+
+    def lift_state_from_subspace(self, 
+            state_to_lift: QuantumState
+        ) -> QuantumState:
+        """ 
+        Lift a QuantumState in the contextual subspace back to the space of the full
+        operator; the inverse of project_state_onto_subspace. For example, the ground
+        state of one contextual subspace may be lifted and projected into another.
+
+        Args:
+            state_to_lift (QuantumState): Quantum State defined over the contextual subspace.
+
+        Returns:
+            Quantum State over the qubits of the full operator.
+        """
+        # if there are no stabilizers, return the input QuantumState
+        if self.stabilizers is None:
+            return state_to_lift
+        
+        assert self.S3_initialized, 'Must first project an operator into the contextual subspace via the project_onto_subspace method'
+        lifted_state = self.lift_state(state_to_lift)
+
+        if self.perform_unitary_partitioning and self.noncontextual_operator.unitary_partitioning_rotations != []:
+            rotation_generator = sum([R*angle*.5*1j for R,angle in self.noncontextual_operator.unitary_partitioning_rotations])
+            rotation = trotter(rotation_generator)
+            return (rotation.dagger * lifted_state).cleanup(zero_threshold=1e-12)
+        else:
+            return lifted_state
\ No newline at end of file
@@ -3,10 +3,9 @@ import numpy as np
 import scipy as sp
 from typing import List, Tuple, Union
 from functools import reduce
-import py3Dmol
 from scipy.sparse import csr_matrix
 from scipy.sparse import kron as sparse_kron
-from symmer.operators.utils import _rref_binary
+from symmer.operators.utils import _rref_binary, binary_array_to_int, packed_parity, random_symplectic_matrix
 import ray
 import os
 # from psutil import cpu_count
@@ -26,7 +25,7 @@ def exact_gs_energy(
 
     Args:
         sparse_matrix (csr_matrix): The sparse matrix for which we want to compute the eigenvalues and eigenvectors.
-        initial_guess (array): The initial guess for the eigenvectors.
+        initial_guess (Union[array, QuantumState]): The initial guess for the eigenvectors, e.g. a previously obtained ground state.
         n_particles (int):  Particle number to restrict eigenvectors |ψ> such that <ψ|N_op|ψ> = n_particles where N_op is the given number operator.
         number_operator (array): Number Operator to restrict eigenvectors |ψ> such that <ψ|N_op|ψ> = n_particles.
         n_eigs (int): The number of eigenvalues and eigenvectors to compute.
@@ -39,14 +38,41 @@ def exact_gs_energy(
         # if no number operator then need not compute any further eigenvalues
         n_eigs = 1
 
+    if isinstance(initial_guess, QuantumState):
+        # allow warm-starting from a QuantumState such as one returned by a previous call
+        assert(initial_guess.n_qubits == round(np.log2(sparse_matrix.shape[0]))), 'Initial guess defined over a different number of qubits'
+        initial_guess = initial_guess.to_sparse_matrix.toarray().reshape(-1)
+
     # Note the eigenvectors are stored column-wise so need to transpose
-    if sparse_matrix.shape[0] > 2**5:
+    if sparse_matrix.shape[0] > 2**12:
+        # for large matrices LOBPCG with a Jacobi (diagonal) preconditioner requires far fewer
+        # sparse matrix-vector products than ARPACK for the clustered low-lying spectrum
+        diagonal = sparse_matrix.diagonal().real
+        sigma = np.min(diagonal)
+        preconditioner = sp.sparse.diags(1/(diagonal-sigma+1e-3))
+        # seeded locally so as not to disturb the global random state
+        X0 = np.random.default_rng(0).standard_normal((sparse_matrix.shape[0], n_eigs)) + 0j
+        if initial_guess is not None:
+            X0[:,0] = np.asarray(initial_guess).reshape(-1)
+        eigvals, eigvecs, residual_norms = sp.sparse.linalg.lobpcg(
+            sparse_matrix, X0, M=preconditioner, largest=False, tol=1e-6, maxiter=1000,
+            retResidualNormsHistory=True
+        )
+        if np.max(residual_norms[-1]) > 1e-6:
+            # LOBPCG only warns on failure to converge, fall back on ARPACK (which raises instead)
+            eigvals, eigvecs = sp.sparse.linalg.eigsh(
+                sparse_matrix,k=n_eigs,v0=initial_guess,which='SA',maxiter=1e7
+            )
+    elif sparse_matrix.shape[0] > 2**8:
         eigvals, eigvecs = sp.sparse.linalg.eigsh(
             sparse_matrix,k=n_eigs,v0=initial_guess,which='SA',maxiter=1e7
         )
     else:
         # for small matrices the dense representation can be more efficient than sparse!
-        eigvals, eigvecs = np.linalg.eigh(sparse_matrix.toarray())
+        # only the lowest n_eigs eigenpairs are computed (LAPACK heevr)
+        eigvals, eigvecs = sp.linalg.eigh(
+            sparse_matrix.toarray(), subset_by_index=[0, min(n_eigs, sparse_matrix.shape[0])-1], driver='evr'
+        )
     
     # order the eigenvalues by increasing size
     order = np.argsort(eigvals)
@@ -59,19 +85,19 @@ def exact_gs_energy(
         assert(number_operator is not None), 'Must specify the number operator.'
         # otherwise, search through the first n_eig eigenvalues and check the Hamming weight
         # of the the corresponding eigenvector - return the first match with n_particles
-        for evl, evc in zip(eigvals, eigvecs.T):
-            psi = QuantumState.from_array(evc.reshape([-1,1])).cleanup(zero_threshold=1e-5)
-            assert(~np.any(number_operator.X_block)), 'Number operator not diagonal'
-            expval_n_particle = 0
-            for Z_symp, Z_coeff in zip(number_operator.Z_block, number_operator.coeff_vec):
-                sign = (-1) ** np.einsum('ij->i', 
-                    np.bitwise_and(
-                        Z_symp, psi.state_matrix
-                    )
-                )
-                expval_n_particle += Z_coeff * np.sum(sign * np.square(abs(psi.state_op.coeff_vec)))
-            if np.round(expval_n_particle) == n_particles:
-                return evl, QuantumState.from_array(evc.reshape([-1,1]))
+        assert(~np.any(number_operator.X_block)), 'Number operator not diagonal'
+        # the number operator diagonal sum_k c_k (-1)^popcount(Z_k & b) over every basis state b,
+        # after which each <ψ|N_op|ψ> is a single dot product of |ψ|^2 with this diagonal
+        basis = np.arange(sparse_matrix.shape[0], dtype=np.uint64)
+        Z_ints = binary_array_to_int(number_operator.Z_block).astype(np.uint64)
+        N_diag = np.zeros(sparse_matrix.shape[0])
+        for coeff, Z_int in zip(number_operator.coeff_vec.real, Z_ints):
+            N_diag += coeff * (1 - 2 * packed_parity(np.bitwise_and(basis, Z_int)[:,None]))
+        expvals_n_particle = np.square(abs(eigvecs)).T @ N_diag
+        matches = np.where(np.round(expvals_n_particle) == n_particles)[0]
+        if matches.size > 0:
+            evl, evc = eigvals[matches[0]], eigvecs[:,matches[0]]
+            return evl, QuantumState.from_array(evc.reshape([-1,1]))
         # if a solution is not found within the first n_eig eigenvalues then error
         raise RuntimeError('No eigenvector of the correct particle number was identified - try increasing n_eigs.')
 
@@ -108,29 +134,18 @@ def random_anitcomm_2n_1_PauliwordOp(n_qubits, complex_coeff=False, apply_cliffo
     Returns:
         P_anticomm (csr_matrix): Anticommuting PauliOperator of size 2n+1 on n qubits with normally distributed coefficients.
     """
-    # base = 'X' * n_qubits
-    # I_term = 'I' * n_qubits
-    # P_list = [base]
-    # for i in range(n_qubits):
-    #     # Z_term
-    #     P_list.append(base[:i] + 'Z' + I_term[i + 1:])
-    #     # Y_term
-    #     P_list.append(base[:i] + 'Y' + I_term[i + 1:])
-    # coeff_vec = np.random.randn(len(P_list)).astype(complex)
-    # if complex_coeff:
-    #     coeff_vec += 1j * np.random.randn((len(P_list)))
-    # P_anticomm = PauliwordOp.from_dictionary((dict(zip(P_list, coeff_vec))))
-
-    Y_base = np.hstack((np.eye(n_qubits), np.tril(np.ones(n_qubits))))
-    X_base = Y_base.copy()
-    X_base[:, n_qubits:] = np.tril(np.ones(n_qubits), -1)
-
-    ac_symp = np.vstack((Y_base, X_base))
-
-    Z_symp = np.zeros(2 * n_qubits)
-    Z_symp[n_qubits:] = np.ones(n_qubits)
-
-    ac_symp = np.vstack((ac_symp, Z_symp)).astype(bool)
+    # build the symplectic blocks directly: n terms Z...ZYI...I, n terms Z...ZXI...I and Z...Z
+    X_block = np.vstack((
+        np.eye(n_qubits, dtype=bool),
+        np.eye(n_qubits, dtype=bool),
+        np.zeros((1, n_qubits), dtype=bool)
+    ))
+    Z_block = np.vstack((
+        np.tri(n_qubits, dtype=bool),
+        np.tri(n_qubits, k=-1, dtype=bool),
+        np.ones((1, n_qubits), dtype=bool)
+    ))
+    ac_symp = np.hstack((X_block, Z_block))
 
     coeff_vec = np.random.randn(ac_symp.shape[0]).astype(complex)
     if complex_coeff:
@@ -140,11 +155,12 @@ def random_anitcomm_2n_1_PauliwordOp(n_qubits, complex_coeff=False, apply_cliffo
 
     if apply_clifford:
         # apply clifford rotations to get rid of structure
-        U_cliff_rotations = []
-        for _ in range(n_qubits * 5):
-            P_rand = PauliwordOp.random(n_qubits, n_terms=1)
-            P_rand.coeff_vec = [1]
-            U_cliff_rotations.append((P_rand, np.random.choice([np.pi/2, -np.pi/2])))
+        n_rotations = n_qubits * 5
+        rotation_symp = random_symplectic_matrix(n_qubits, n_rotations)
+        angles = np.random.choice([np.pi/2, -np.pi/2], size=n_rotations)
+        U_cliff_rotations = [
+            (PauliwordOp(symp_vec, [1]), angle) for symp_vec, angle in zip(rotation_symp, angles)
+        ]
 
         P_anticomm = P_anticomm.perform_rotations(U_cliff_rotations)
 
@@ -160,6 +176,10 @@ def random_anitcomm_2n_1_PauliwordOp(n_qubits, complex_coeff=False, apply_cliffo
 def tensor_list(factor_list:List[PauliwordOp]) -> PauliwordOp:
     """ 
     Given a list of PauliwordOps, recursively tensor from the right
+
+    The factors are combined pairwise in a balanced binary tree (the tensor product
+    is associative), so that each level tensors operators of similar size rather than
+    repeatedly growing a single accumulator.
     
     Args:
         factor_list (list): list of PauliwordOps
@@ -167,7 +187,13 @@ def tensor_list(factor_list:List[PauliwordOp]) -> PauliwordOp:
     Returns: 
         Tensor Product of items in factor_list from the right 
     """
-    return reduce(lambda x,y:x.tensor(y), factor_list)
+    factor_list = list(factor_list)
+    while len(factor_list) > 1:
+        paired = [a.tensor(b) for a,b in zip(factor_list[0::2], factor_list[1::2])]
+        if len(factor_list) % 2:
+            paired.append(factor_list[-1])
+        factor_list = paired
+    return factor_list[0]
 
 
 def product_list(product_list:List[PauliwordOp]) -> PauliwordOp:
@@ -186,7 +212,7 @@ def product_list(product_list:List[PauliwordOp]) -> PauliwordOp:
 def gram_schmidt_from_quantum_state(state:Union[np.array, list, QuantumState]) ->np.array:
     """
     build a unitary to build a quantum state from the zero state (aka state defines first column of unitary)
-    uses gram schmidt to find other (orthogonal) columns of matrix
+    uses gram schmidt (via a QR decomposition) to find other (orthogonal) columns of matrix
 
     Args:
         state (np.array): 1D array of quantum state (size 2^N qubits)
@@ -210,24 +236,25 @@ def gram_schmidt_from_quantum_state(state:Union[np.array, list, QuantumState]) -
 
     # reorder if state has 0 amp on zero index
     if np.isclose(state[0], 0):
-        max_amp_ind = np.argmax(state)
+        max_amp_ind = np.argmax(np.abs(state))
         M[:, [0, max_amp_ind]] = M[:, [max_amp_ind,0]]
 
     # defines first column
     M[:, 0] = state
-    for a in range(M.shape[0]):
-        for b in range(a):
-            M[:, a]-= (M[:, b].conj().T @ M[:, a]) * M[:, b]
 
-        # normalize
-        M[:, a] = M[:, a] / np.linalg.norm( M[:, a])
+    # QR decomposition orthonormalizes the columns of M as in Gram-Schmidt, up to a phase
+    # on each column that is fixed by the diagonal of R (so the first column is the input state)
+    Q, R = np.linalg.qr(M)
+    phases = np.diag(R).copy()
+    phases[np.isclose(phases, 0)] = 1
+    M = Q * (phases / np.abs(phases))
 
     return M
 
 
 def Draw_molecule(
         xyz_string: str, width: int = 400, height: int = 400, style: str = "sphere"
-    ) -> py3Dmol.view:
+    ) -> "py3Dmol.view":
     """Draw molecule from xyz string.
 
     Note if molecule has unrealistic bonds, then style should be sphere. Otherwise stick style can be used
@@ -244,6 +271,9 @@ def Draw_molecule(
     Returns:
         view (py3dmol.view object). Run view.show() method to print molecule.
     """
+    # imported here as py3Dmol is only needed for visualisation
+    import py3Dmol
+
     view = py3Dmol.view(width=width, height=height)
     view.addModel(xyz_string, "xyz")
     if style == "sphere":
@@ -565,6 +565,16 @@ def test_termwise_commutatvity(
         ]))
     )
 
+def test_termwise_commutatvity_multiple_words():
+    """ Tests commutation of operators spanning more than one 64-qubit word
+    """
+    P1 = PauliwordOp.random(130, 20)
+    P2 = PauliwordOp.random(130, 15)
+    symplectic_form = (
+        P1.X_block.astype(int) @ P2.Z_block.T.astype(int) + P1.Z_block.astype(int) @ P2.X_block.T.astype(int)
+    )
+    assert np.all(P1.commutes_termwise(P2) == (symplectic_form % 2 == 0))
+
 def test_adjacency_matrix(
     pauli_list_2
     ):
@@ -707,7 +717,8 @@ def test_to_sparse_matrix_1():
         ({'Z':1}, np.array([[1,0],[0,-1]])),
         ({'XY':1}, np.array([[0,0,0,-1j],[0,0,1j,0],[0,-1j,0,0],[1j,0,0,0]])),
         ({'ZY':1}, np.array([[0,-1j,0,0],[1j,0,0,0],[0,0,0,1j],[0,0,-1j,0]])),
-        ({'II':1, 'IX':1, 'XI':1, 'XX':1}, np.ones([4,4]))
+        ({'II':1, 'IX':1, 'XI':1, 'XX':1}, np.ones([4,4])),
+        ({'ZZ':1, 'IZ':1, 'XI':1, 'YZ':1j}, np.array([[2,0,2,0],[0,-2,0,0],[0,0,0,0],[0,2,0,0]]))
     ]
 )
 def test_to_sparse_matrix_2(
@@ -152,6 +152,20 @@ def test_project_state_onto_subspace(up_method):
     projected_state = CS.project_state_onto_subspace(QT.tapered_ref_state)
     assert projected_state == QuantumState([[0,0,0]], [-1])
 
+@pytest.mark.parametrize("up_method", ['LCU', 'seq_rot'])
+def test_lift_state_from_subspace(up_method):
+    CS = ContextualSubspace(
+        H_taper, noncontextual_strategy='SingleSweep_magnitude',
+        unitary_partitioning_method=up_method
+    )
+    CS.update_stabilizers(3, aux_operator=CC_taper, strategy='aux_preserving')
+    H_cs = CS.project_onto_subspace()
+    gs_nrg, gs_psi = exact_gs_energy(H_cs.to_sparse_matrix)
+    lifted_state = CS.lift_state_from_subspace(gs_psi)
+    assert lifted_state.n_qubits == H_taper.n_qubits
+    assert np.isclose(H_taper.expval(lifted_state), gs_nrg)
+    assert np.isclose(abs(CS.project_state_onto_subspace(lifted_state).dagger * gs_psi), 1)
+
 def test_project_state_onto_subspace_before_operator():
     CS = ContextualSubspace(H_taper, noncontextual_strategy='StabilizeFirst')
     CS.update_stabilizers(3, aux_operator=CC_taper, strategy='aux_preserving')
@@ -2,10 +2,14 @@ from symmer.operators import PauliwordOp, QuantumState
 from symmer.utils import (exact_gs_energy, random_anitcomm_2n_1_PauliwordOp,Draw_molecule,
                           tensor_list, gram_schmidt_from_quantum_state, product_list,
                           get_sparse_matrix_large_pauliwordop, matrix_allclose)
+import os
+import json
 import numpy as np
 from openfermion import QubitOperator
 import py3Dmol
 
+ham_data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'hamiltonian_data')
+
 H2_sto3g = {'qubit_encoding': 'jordan_wigner',
  'unit': 'angstrom',
  'geometry': '2\n \nH\t0\t0\t0\nH\t0\t0\t0.74',
@@ -342,6 +346,46 @@ def test_exact_gs_energy_H3_plus():
     assert np.isclose(gs_state.dagger * H * gs_state, E_ref)
 
 
+def test_exact_gs_energy_lobpcg():
+    # 14-qubit Hamiltonian, above the size at which LOBPCG is used
+    with open(os.path.join(ham_data_dir, 'BeH2_STO-3G_SINGLET_JW.json'), 'r') as f:
+        H_data = json.load(f)
+    H = PauliwordOp.from_dictionary(H_data['hamiltonian'])
+    E_ref = H_data['data']['calculated_properties']['FCI']['energy']
+    num_operator = PauliwordOp.from_dictionary(H_data['data']['auxiliary_operators']['number_operator'])
+    n_part = H_data['data']['n_particles']
+
+    H_sparse = H.to_sparse_matrix
+    random_state = np.random.get_state()
+    gs_energy, gs_state = exact_gs_energy(H_sparse,
+                                          number_operator=num_operator,
+                                          n_particles=n_part)
+
+    assert np.isclose(gs_energy, E_ref), 'reference energy does NOT match true gs'
+    psi = gs_state.to_sparse_matrix
+    assert np.isclose((psi.H @ H_sparse @ psi).toarray()[0,0], E_ref)
+    # the global random state is left untouched
+    assert np.all(np.random.get_state()[1] == random_state[1])
+
+
+def test_exact_gs_energy_initial_guess():
+    # 10-qubit Hamiltonian, large enough for the sparse eigsh solver that makes use of the initial guess
+    with open(os.path.join(ham_data_dir, 'Be_STO-3G_SINGLET_JW.json'), 'r') as f:
+        H_data = json.load(f)
+    H = PauliwordOp.from_dictionary(H_data['hamiltonian'])
+    E_ref = H_data['data']['calculated_properties']['FCI']['energy']
+    H_sparse = H.to_sparse_matrix
+    assert 2**8 < H_sparse.shape[0] <= 2**12
+
+    gs_energy, gs_state = exact_gs_energy(H_sparse)
+    assert np.isclose(gs_energy, E_ref), 'reference energy does NOT match true gs'
+    # warm-start from the previously obtained ground state
+    gs_energy_warm, gs_state_warm = exact_gs_energy(H_sparse, initial_guess=gs_state)
+
+    assert np.isclose(gs_energy_warm, gs_energy)
+    assert np.isclose(abs(gs_state_warm.dagger * gs_state), 1)
+
+
 def test_random_anitcomm_2n_1_PauliwordOp_method():
     n_qubits = 5
     complex_coeff = False